@@ -1,207 +1,322 @@
 import sys
-from collections import deque, defaultdict
+import heapq
+import random
+from multiprocessing import Pool
+from array import array
 
 def parse_dimacs(file_path):
-    clauses = []
-    vars_count = 0
-    seen = set()
-
     try:
-        with open(file_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('c'):
-                    continue
-                if line.startswith('p'):
-                    parts = line.split()
-                    if len(parts) >= 4 and parts[1] == 'cnf':
-                        vars_count = int(parts[2])
-                    continue
-                parts = line.split()
-                lits = []
-                for tok in parts:
-                    lit = int(tok)
-                    if lit == 0:
-                        break
-                    v = abs(lit)
-                    if v < 1 or (vars_count and v > vars_count):
-                        lits = []
-                        break
-                    lits.append(lit)
-                if not lits:
-                    if parts and parts[0] == '0':
-                        return vars_count, [[]]
-                    continue
-                key = tuple(sorted(lits))
-                if key in seen:
-                    continue
-                seen.add(key)
-                clauses.append(lits)
+        with open(file_path, 'rb') as f:
+            data = f.read()
     except IOError:
         print(f"Error: cannot open {file_path}")
         sys.exit(1)
 
+    return parse_dimacs_data(data)
+
+def parse_dimacs_data(data):
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    clauses = []
+    vars_count = 0
+    seen = set()
+
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line.startswith(b'c'):
+            continue
+        if line.startswith(b'p'):
+            parts = line.split()
+            if len(parts) >= 4 and parts[1] == b'cnf':
+                vars_count = int(parts[2])
+            continue
+        lits = list(map(int, line.split()))
+        if 0 in lits:
+            del lits[lits.index(0):]
+            if not lits:
+                return vars_count, [[]]
+        if vars_count and max(map(abs, lits)) > vars_count:
+            continue
+        key = frozenset(lits)
+        if key in seen or any(-l in key for l in key):
+            continue
+        seen.add(key)
+        lits = list(dict.fromkeys(lits))
+        clauses.append(lits)
+
     return vars_count, clauses
 
-def solve_cdcl(vars_count, clauses):
-    assignment = {}
-    level = {}
-    reason = {}
-    trail = []
+def luby(i):
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2*size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 2 ** seq
+
+def propagate(lit_buf, clause_off, watchers, watches, values, level,
+              reason, trail, qhead, decision_level, num_vars):
+    while qhead < len(trail):
+        false_lit = -trail[qhead]
+        qhead += 1
+        ws = watches[false_lit + num_vars]
+        i = j = 0
+        n = len(ws)
+        while i < n:
+            slot = ws[i]
+            i += 1
+            ci = slot >> 1
+            other = watchers[slot ^ 1]
+            ov = values[other + num_vars]
+            if ov == 1:
+                ws[j] = slot
+                j += 1
+                continue
+            for k in range(clause_off[ci], clause_off[ci+1]):
+                lit = lit_buf[k]
+                if lit == false_lit or lit == other:
+                    continue
+                if values[lit + num_vars] != -1:
+                    watchers[slot] = lit
+                    watches[lit + num_vars].append(slot)
+                    break
+            else:
+                ws[j] = slot
+                j += 1
+                if ov == -1:
+                    del ws[j:i]
+                    return ci, len(trail)
+                v = abs(other)
+                values[other + num_vars] = 1
+                values[num_vars - other] = -1
+                level[v] = decision_level
+                reason[v] = ci
+                trail.append(other)
+        del ws[j:]
+    return -1, qhead
+
+def solve_cdcl(vars_count, clauses, seed=0, initial_phase='pos', decay=0.95,
+               restart_base=100, var_activity_jitter=0.0):
+    rnd = random.Random(seed)
+    values = [0] * (2*vars_count + 1)
+    level = [0] * (vars_count+1)
+    reason = [None] * (vars_count+1)
+    trail = array('i')
+    qhead = 0
     decision_level = 0
 
-    activity = {v: 0.0 for v in range(1, vars_count+1)}
-    decay_counter = 0
+    activity = [0.0] * (vars_count+1)
+    if var_activity_jitter:
+        for v in range(1, vars_count+1):
+            activity[v] = rnd.random() * var_activity_jitter
+    var_inc = 1.0
+    order_heap = [(-activity[v], v) for v in range(1, vars_count+1)]
+    heapq.heapify(order_heap)
+    seen = bytearray(vars_count+1)
+    if initial_phase == 'pos':
+        phase = [1] * (vars_count+1)
+    elif initial_phase == 'neg':
+        phase = [-1] * (vars_count+1)
+    elif initial_phase == 'random':
+        phase = [rnd.choice((1, -1)) for _ in range(vars_count+1)]
+    else:
+        raise ValueError(f"unknown initial_phase: {initial_phase!r}")
 
-    lit2cls = defaultdict(list)
-    for idx, cl in enumerate(clauses):
-        for lit in cl:
-            lit2cls[lit].append(idx)
+    conflicts = 0
+    restart_idx = 0
+    next_restart = restart_base * luby(restart_idx)
 
-    prop_queue = deque()
+    lit_buf = array('i')
+    clause_off = array('i', [0])
+    watchers = array('i')
+    watches = [[] for _ in range(2*vars_count + 1)]
 
-    def val_of(lit):
-        v = abs(lit)
-        if v not in assignment:
-            return None
-        return assignment[v] if lit > 0 else not assignment[v]
+    def add_clause(lits):
+        ci = len(clause_off) - 1
+        lit_buf.extend(lits)
+        clause_off.append(len(lit_buf))
+        if len(lits) >= 2:
+            watchers.extend((lits[0], lits[1]))
+            watches[lits[0] + vars_count].append(2*ci)
+            watches[lits[1] + vars_count].append(2*ci + 1)
+        else:
+            watchers.extend((0, 0))
+        return ci
+
+    def clause_lits(ci):
+        return lit_buf[clause_off[ci]:clause_off[ci+1]]
+
+    unit_clauses = []
+    for cl in sorted((list(dict.fromkeys(map(int, cl))) for cl in clauses),
+                     key=len):
+        if not cl:
+            return False, {}
+        ci = add_clause(cl)
+        if len(cl) == 1:
+            unit_clauses.append((ci, cl[0]))
 
     def enqueue(lit, from_clause):
         v = abs(lit)
-        val = (lit > 0)
-        if v in assignment:
-            return assignment[v] == val
-        assignment[v] = val
+        if values[lit + vars_count] != 0:
+            return values[lit + vars_count] == 1
+        values[lit + vars_count] = 1
+        values[vars_count - lit] = -1
         level[v] = decision_level
         reason[v] = from_clause
-        trail.append(v)
-        prop_queue.append(lit)
+        trail.append(lit)
         return True
 
     def unit_propagate():
-        while prop_queue:
-            lit = prop_queue.popleft()
-            neg = -lit
-            for ci in lit2cls[neg]:
-                cl = clauses[ci]
-                satisfied = False
-                unassigned = 0
-                last_lit = None
-                for l in cl:
-                    v = val_of(l)
-                    if v is True:
-                        satisfied = True
-                        break
-                    if v is None:
-                        unassigned += 1
-                        last_lit = l
-                if satisfied:
-                    continue
-                if unassigned == 0:
-                    return cl
-                if unassigned == 1:
-                    if not enqueue(last_lit, cl):
-                        return cl
-        return None
+        nonlocal qhead
+        confl, qhead = propagate(lit_buf, clause_off, watchers, watches,
+                                 values, level, reason, trail, qhead,
+                                 decision_level, vars_count)
+        return None if confl == -1 else confl
+
+    def rebuild_order_heap():
+        order_heap[:] = [(-activity[v], v) for v in range(1, vars_count+1)
+                         if not values[v + vars_count]]
+        heapq.heapify(order_heap)
+
+    def pick_branch_var():
+        while order_heap:
+            _, v = heapq.heappop(order_heap)
+            if not values[v + vars_count]:
+                return v
+        return 0
+
+    def bump(v):
+        nonlocal var_inc
+        activity[v] += var_inc
+        if activity[v] > 1e100:
+            activity[:] = [a * 1e-100 for a in activity]
+            var_inc *= 1e-100
+            rebuild_order_heap()
 
     def backtrack_to(target):
-        nonlocal decision_level
-        while trail and level[trail[-1]] > target:
-            v = trail.pop()
-            del assignment[v]
-            del level[v]
-            del reason[v]
+        nonlocal decision_level, qhead
+        while trail and level[abs(trail[-1])] > target:
+            lit = trail.pop()
+            v = abs(lit)
+            phase[v] = 1 if lit > 0 else -1
+            values[lit + vars_count] = 0
+            values[vars_count - lit] = 0
+            heapq.heappush(order_heap, (-activity[v], v))
         decision_level = target
+        qhead = len(trail)
+        if len(order_heap) > 4 * vars_count:
+            rebuild_order_heap()
 
-    def conflict_analysis(conflict_clause):
-        learned = list(conflict_clause)
-        cur_lvl = decision_level
+    def conflict_analysis(conflict_ci):
+        learned = [0]
+        counter = 0
+        var = 0
+        ci = conflict_ci
+        idx = len(trail) - 1
 
         while True:
-            cnt = 0
-            last = None
-            for l in learned:
-                if level.get(abs(l), 0) == cur_lvl:
-                    cnt += 1
-                    last = l
-            if cnt <= 1:
-                break
-            var = abs(last)
-            reason_cl = reason.get(var)
-            if not reason_cl:
+            for l in clause_lits(ci):
+                v = abs(l)
+                if v == var or seen[v] or level[v] == 0:
+                    continue
+                seen[v] = 1
+                bump(v)
+                if level[v] == decision_level:
+                    counter += 1
+                else:
+                    learned.append(l)
+            while not seen[abs(trail[idx])]:
+                idx -= 1
+            p = trail[idx]
+            var = abs(p)
+            idx -= 1
+            seen[var] = 0
+            counter -= 1
+            if counter == 0:
                 break
-            new_lear = [l for l in learned if abs(l) != var]
-            for l in reason_cl:
-                if abs(l) != var and l not in new_lear:
-                    new_lear.append(l)
-            learned = new_lear
-
-        max_lvl = -1
-        asserting = None
-        for l in learned:
-            lvl = level.get(abs(l), 0)
-            if lvl > max_lvl:
-                max_lvl = lvl
-                asserting = l
+            ci = reason[var]
 
+        learned[0] = -p
         back_lvl = 0
-        for l in learned:
-            if l == asserting:
-                continue
-            lvl = level.get(abs(l), 0)
+        for i in range(1, len(learned)):
+            seen[abs(learned[i])] = 0
+            lvl = level[abs(learned[i])]
             if lvl > back_lvl:
                 back_lvl = lvl
+                learned[1], learned[i] = learned[i], learned[1]
 
-        return learned, asserting, back_lvl
+        return learned, back_lvl
 
-    for cl in clauses:
-        if len(cl) == 1:
-            enqueue(cl[0], cl)
+    for ci, lit in unit_clauses:
+        if not enqueue(lit, ci):
+            return False, {}
     confl = unit_propagate()
-    if confl:
+    if confl is not None:
         return False, {}
 
     while True:
-        if len(assignment) == vars_count:
-            return True, assignment
+        if confl is None and len(trail) == vars_count:
+            return True, {v: values[v + vars_count] > 0
+                          for v in range(1, vars_count+1)}
 
         if confl is None:
-            unass = [v for v in range(1, vars_count+1) if v not in assignment]
-            var = max(unass, key=lambda v: activity[v])
+            if conflicts >= next_restart:
+                backtrack_to(0)
+                restart_idx += 1
+                next_restart += restart_base * luby(restart_idx)
+            var = pick_branch_var()
             decision_level += 1
-            lit = var
-            if not enqueue(lit, None):
-                confl = [-lit]
-            else:
-                confl = unit_propagate()
+            enqueue(var if phase[var] > 0 else -var, None)
+            confl = unit_propagate()
 
-        if confl:
+        if confl is not None:
             if decision_level == 0:
                 return False, {}
-            learned, asserting, back_lvl = conflict_analysis(confl)
-            if not learned:
-                return False, {}
-            clauses.append(learned)
-            ci = len(clauses) - 1
-            for l in learned:
-                lit2cls[l].append(ci)
-            for l in learned:
-                activity[abs(l)] += 1.0
-            decay_counter += 1
-            if decay_counter >= 50:
-                for v in activity:
-                    activity[v] *= 0.5
-                decay_counter = 0
+            conflicts += 1
+            learned, back_lvl = conflict_analysis(confl)
+            ci = add_clause(learned)
+            var_inc /= decay
             backtrack_to(back_lvl)
-            enqueue(asserting, learned)
+            enqueue(learned[0], ci)
             confl = unit_propagate()
 
+def portfolio_configs(n):
+    phases = ['pos', 'neg', 'random']
+    configs = []
+    for i in range(n):
+        configs.append({
+            'seed': i,
+            'initial_phase': phases[i % len(phases)],
+            'decay': 0.95 if i % 2 == 0 else 0.9,
+            'restart_base': 100 if i % 4 < 2 else 50,
+            'var_activity_jitter': 0.0 if i == 0 else 1.0,
+        })
+    return configs
+
+def solve_with_config(job):
+    vars_count, clauses, config = job
+    return solve_cdcl(vars_count, clauses, **config)
+
+def solve_portfolio(vars_count, clauses, workers):
+    jobs = [(vars_count, clauses, config) for config in portfolio_configs(workers)]
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(solve_with_config, jobs):
+            return result
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python cdcl_solver.py <file.cnf>")
+    args = sys.argv[1:]
+    workers = 1
+    if len(args) == 3 and args[0] == '--portfolio' and args[1].isdigit():
+        workers = int(args[1])
+        args = args[2:]
+    if len(args) != 1 or workers < 1:
+        print("Usage: python cdcl_solver.py [--portfolio N] <file.cnf>")
         sys.exit(1)
 
-    cnf = sys.argv[1]
+    cnf = args[0]
     vars_count, clauses = parse_dimacs(cnf)
 
     if vars_count == 0:
@@ -211,7 +326,10 @@ def main():
             print("UNSAT")
         return
 
-    sat, model = solve_cdcl(vars_count, clauses)
+    if workers > 1:
+        sat, model = solve_portfolio(vars_count, clauses, workers)
+    else:
+        sat, model = solve_cdcl(vars_count, clauses)
     if sat:
         print("SAT")
         lits = []